@@ -2,8 +2,7 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime
-import time
-from streamlit_autorefresh import st_autorefresh
+from streamlit.runtime.caching import get_data_cache_stats_provider, get_resource_cache_stats_provider
 
 from metrics import CryptoMetrics
 from triggers import TriggerEngine
@@ -17,9 +16,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Auto-refresh every 12 hours (43,200,000 ms)
-st_autorefresh(interval=43_200_000, key="12h_refresh")
-
 # Initialize components
 @st.cache_resource
 def init_components():
@@ -27,8 +23,14 @@ def init_components():
     trigger_engine = TriggerEngine()
     return metrics_client, trigger_engine
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_metrics(_metrics_client):
+    """Fetch all metrics, memoized across reruns for up to an hour"""
+    return _metrics_client.get_all_metrics()
+
+@st.cache_resource(show_spinner=False)
 def create_allocation_gauge(allocation_pct):
-    """Create a gauge chart for portfolio allocation"""
+    """Create a gauge chart for portfolio allocation, shared per allocation tuple"""
     btc_pct, alt_pct, stable_pct = allocation_pct
     
     fig = go.Figure()
@@ -121,12 +123,17 @@ def display_triggers_status(trigger_results):
     else:
         st.success("No active triggers")
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _recent_entries_df(limit=10, total_entries=0):
+    """Recent journal entries as a DataFrame; total_entries keys the cache to new writes"""
+    return pd.DataFrame(read_journal(limit=limit))
+
 def display_journal_summary():
     """Display recent journal entries"""
     st.subheader("📝 Trading Journal")
     
     stats = get_journal_stats()
-    recent_entries = read_journal(limit=10)
+    recent_entries = _recent_entries_df(limit=10, total_entries=stats['total_entries'])
     
     if stats['total_entries'] > 0:
         col1, col2 = st.columns(2)
@@ -143,35 +150,55 @@ def display_journal_summary():
                 st.write(f"Change: {stats['last_entry']['change_pct']}%")
                 st.write(f"Reason: {stats['last_entry']['reason']}")
         
-        if recent_entries:
+        if not recent_entries.empty:
             st.write("**Recent Entries:**")
-            df = pd.DataFrame(recent_entries)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(recent_entries, use_container_width=True)
     else:
         st.info("No journal entries yet")
 
-def main():
-    st.title("📊 Crypto 3-Bucket Dashboard")
-    st.markdown("*Smart allocation signals for BTC • ALTS • STABLES*")
-    
-    # Initialize
-    metrics_client, trigger_engine = init_components()
+def cache_stats_df():
+    """Per-function entry counts and memory footprint for st.cache_data / st.cache_resource"""
+    stats = get_data_cache_stats_provider().get_stats() + get_resource_cache_stats_provider().get_stats()
+    
+    if not stats:
+        return pd.DataFrame(columns=['category', 'function', 'entries', 'bytes'])
+    
+    df = pd.DataFrame(
+        [(stat.category_name, stat.cache_name, stat.byte_length) for stat in stats],
+        columns=['category', 'function', 'bytes']
+    )
+    return (df.groupby(['category', 'function'])
+              .agg(entries=('bytes', 'size'), bytes=('bytes', 'sum'))
+              .reset_index())
+
+@st.fragment
+def sidebar_controls():
+    """Sidebar widgets; interacting with them reruns only this fragment"""
+    st.header("⚙️ Controls")
     
-    # Sidebar controls
-    st.sidebar.header("⚙️ Controls")
+    if st.button("🔄 Refresh Data"):
+        load_metrics.clear()
+        st.rerun()
     
-    if st.sidebar.button("🔄 Refresh Data"):
+    auto_refresh = st.checkbox("🔄 Auto-refresh (12h)", value=True, key="auto_refresh")
+    # The body's refresh timer is only set on a full run, so a toggle reruns the whole app
+    if auto_refresh != st.session_state.auto_refresh_applied:
         st.rerun()
     
-    auto_refresh = st.sidebar.checkbox("🔄 Auto-refresh (12h)", value=True)
+    with st.expander("🔬 Cache Stats"):
+        st.dataframe(cache_stats_df(), use_container_width=True, hide_index=True)
+
+def dashboard_body():
+    """Main dashboard, run as a fragment so its refresh timer never touches the sidebar"""
+    metrics_client, trigger_engine = init_components()
     
     # Load data
     with st.spinner("Loading market data..."):
-        metrics = metrics_client.get_all_metrics()
+        metrics = load_metrics(metrics_client)
         trigger_results = trigger_engine.check_all_triggers(metrics)
     
     # Display last updated
-    st.sidebar.write(f"**Last Updated:** {datetime.fromtimestamp(metrics['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
+    st.caption(f"**Last Updated:** {datetime.fromtimestamp(metrics['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
     
     # Main dashboard
     display_metrics_cards(metrics)
@@ -209,5 +236,19 @@ def main():
         for event in metrics['macro_events']:
             st.write(f"**{event['event']}** - {event['date']}")
 
+def main():
+    st.title("📊 Crypto 3-Bucket Dashboard")
+    st.markdown("*Smart allocation signals for BTC • ALTS • STABLES*")
+    
+    # Refresh the body every 12h only while the sidebar checkbox is ticked
+    auto_refresh = st.session_state.get("auto_refresh", True)
+    st.session_state.auto_refresh_applied = auto_refresh
+    
+    # Sidebar controls
+    with st.sidebar:
+        sidebar_controls()
+    
+    st.fragment(run_every="12h" if auto_refresh else None)(dashboard_body)()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
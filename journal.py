@@ -1,63 +1,179 @@
+import atexit
 import csv
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Optional
 
-def ensure_journal_exists(filepath: str = "trading_journal.csv"):
-    """Create journal file with headers if it doesn't exist"""
-    if not os.path.exists(filepath):
-        with open(filepath, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(['date', 'asset', 'change_pct', 'reason', 'emotion'])
+FIELDNAMES = ['date', 'asset', 'change_pct', 'reason', 'emotion']
 
-def append_journal_entry(asset: str, change_pct: float, reason: str, emotion: str, 
-                        filepath: str = "trading_journal.csv"):
+# Long-lived connections, keyed by journal path
+_CONNECTIONS = {}
+_LOCK = threading.Lock()
+
+def _parse_change(value) -> Optional[float]:
+    """Parse a change_pct value, returning None for non-numeric values"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _legacy_csv_path(filepath: str) -> str:
+    """The CSV journal a database replaces, e.g. trading_journal.db -> trading_journal.csv"""
+    return os.path.splitext(filepath)[0] + ".csv"
+
+def _read_csv(csv_path: str) -> list:
+    """Read entries from a legacy CSV journal"""
+    with open(csv_path, 'r', newline='') as file:
+        return [
+            (entry['date'], entry['asset'], _parse_change(entry['change_pct']),
+             entry['reason'], entry['emotion'])
+            for entry in csv.DictReader(file)
+        ]
+
+def _connect(filepath: str) -> sqlite3.Connection:
+    """Return the cached connection for a journal, creating the schema if needed (lock held by caller)"""
+    if filepath not in _CONNECTIONS:
+        conn = sqlite3.connect(filepath, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Schema and legacy import commit together, so a failed import is retried next time
+        try:
+            conn.execute("BEGIN")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL,
+                    asset TEXT,
+                    change_pct REAL,
+                    reason TEXT,
+                    emotion TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_date ON entries (date)")
+            csv_path = _legacy_csv_path(filepath)
+            is_empty = conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+            if is_empty and os.path.exists(csv_path):
+                conn.executemany(
+                    "INSERT INTO entries (date, asset, change_pct, reason, emotion) VALUES (?, ?, ?, ?, ?)",
+                    _read_csv(csv_path)
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            conn.close()
+            raise
+        _CONNECTIONS[filepath] = conn
+    return _CONNECTIONS[filepath]
+
+@atexit.register
+def _close_all_connections():
+    with _LOCK:
+        for conn in _CONNECTIONS.values():
+            conn.close()
+        _CONNECTIONS.clear()
+
+def _has_database(filepath: str) -> bool:
+    """True if the journal database is open or on disk"""
+    return filepath in _CONNECTIONS or os.path.exists(filepath)
+
+def _read_legacy_entries(filepath: str) -> list:
+    """Entries from the journal's legacy CSV, read without creating the database"""
+    csv_path = _legacy_csv_path(filepath)
+    if not os.path.exists(csv_path):
+        return []
+    return [dict(zip(FIELDNAMES, row)) for row in _read_csv(csv_path)]
+
+def _row_to_entry(row: sqlite3.Row) -> dict:
+    return {field: row[field] for field in FIELDNAMES}
+
+def ensure_journal_exists(filepath: str = "trading_journal.db"):
+    """Create journal database and schema if they don't exist"""
+    with _LOCK:
+        _connect(filepath)
+
+def append_journal_entry(asset: str, change_pct: float, reason: str, emotion: str,
+                        filepath: str = "trading_journal.db"):
     """Append a new entry to the trading journal"""
-    ensure_journal_exists(filepath)
-    
-    with open(filepath, 'a', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow([
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            asset,
-            change_pct,
-            reason,
-            emotion
-        ])
-
-def read_journal(filepath: str = "trading_journal.csv", limit: Optional[int] = None) -> list:
+    append_journal_entries([(asset, change_pct, reason, emotion)], filepath)
+
+def append_journal_entries(entries: list, filepath: str = "trading_journal.db"):
+    """Append several (asset, change_pct, reason, emotion) entries in one transaction"""
+    if not entries:
+        return
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    rows = [(now, asset, change_pct, reason, emotion)
+            for asset, change_pct, reason, emotion in entries]
+
+    with _LOCK:
+        conn = _connect(filepath)
+        with conn:
+            conn.executemany(
+                "INSERT INTO entries (date, asset, change_pct, reason, emotion) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+def read_journal(filepath: str = "trading_journal.db", limit: Optional[int] = None) -> list:
     """Read journal entries, optionally limited to recent entries"""
-    if not os.path.exists(filepath):
-        return []
-    
-    with open(filepath, 'r', newline='') as file:
-        reader = csv.DictReader(file)
-        entries = list(reader)
-        
+    if not _has_database(filepath):
+        entries = _read_legacy_entries(filepath)
+        return entries[-limit:] if limit else entries
+
+    with _LOCK:
+        conn = _connect(filepath)
         if limit:
-            return entries[-limit:]
-        return entries
+            rows = conn.execute(
+                "SELECT * FROM entries ORDER BY date DESC, id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            rows.reverse()
+        else:
+            rows = conn.execute("SELECT * FROM entries ORDER BY date, id").fetchall()
+
+    return [_row_to_entry(row) for row in rows]
 
-def get_journal_stats(filepath: str = "trading_journal.csv") -> dict:
+def get_journal_stats(filepath: str = "trading_journal.db") -> dict:
     """Get basic statistics from the journal"""
-    entries = read_journal(filepath)
-    
-    if not entries:
+    if not _has_database(filepath):
+        entries = _read_legacy_entries(filepath)
+        changes = [entry['change_pct'] for entry in entries if entry['change_pct'] is not None]
+        total_entries = len(entries)
+        total_changes = sum(changes)
+        avg_change = total_changes / len(changes) if changes else 0
+        last_entry = entries[-1] if entries else None
+    else:
+        with _LOCK:
+            conn = _connect(filepath)
+            total_entries, total_changes, avg_change = conn.execute(
+                "SELECT COUNT(*), SUM(change_pct), AVG(change_pct) FROM entries"
+            ).fetchone()
+            last_row = conn.execute(
+                "SELECT * FROM entries ORDER BY date DESC, id DESC LIMIT 1"
+            ).fetchone()
+            last_entry = _row_to_entry(last_row) if last_row else None
+
+    if not total_entries:
         return {
             'total_entries': 0,
             'total_changes': 0,
             'avg_change': 0,
             'last_entry': None
         }
-    
-    total_entries = len(entries)
-    changes = [float(entry['change_pct']) for entry in entries if entry['change_pct'].replace('-', '').replace('.', '').isdigit()]
-    total_changes = sum(changes)
-    avg_change = total_changes / len(changes) if changes else 0
-    
+
     return {
         'total_entries': total_entries,
-        'total_changes': total_changes,
-        'avg_change': avg_change,
-        'last_entry': entries[-1] if entries else None
-    }
\ No newline at end of file
+        'total_changes': total_changes or 0,
+        'avg_change': avg_change or 0,
+        'last_entry': last_entry
+    }
+
+def export_journal_csv(csv_path: Optional[str] = None, filepath: str = "trading_journal.db"):
+    """Export the journal to the legacy CSV format, next to the database by default"""
+    entries = read_journal(filepath)
+    if csv_path is None:
+        csv_path = _legacy_csv_path(filepath)
+
+    with open(csv_path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(entries)
@@ -1,54 +1,72 @@
 import os
-import requests
+import asyncio
+import aiohttp
 import time
 import csv
 import io
+import ijson
+from collections import deque
 from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 3
+
 class CryptoMetrics:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
+        self.timeout = aiohttp.ClientTimeout(total=10)
         
-    def _make_request(self, url: str, params: Optional[Dict] = None, 
-                     headers: Optional[Dict] = None, json_data: Optional[Dict] = None) -> Optional[Dict]:
-        """Make HTTP request with retry logic"""
-        for attempt in range(3):
+    def _make_session(self) -> aiohttp.ClientSession:
+        """Create a session for one fan-out; sockets are kept alive across its requests"""
+        connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=30)
+        return aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=self.timeout)
+    
+    async def _request(self, session: aiohttp.ClientSession, method: str, url: str,
+                       **kwargs) -> aiohttp.ClientResponse:
+        """Send a request, retrying connection errors and 429/5xx with backoff"""
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
             try:
-                if json_data:
-                    response = self.session.post(url, json=json_data, headers=headers, timeout=10)
-                else:
-                    response = self.session.get(url, params=params, headers=headers, timeout=10)
-                
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                print(f"Request failed (attempt {attempt + 1}): {e}")
-                if attempt < 2:
-                    time.sleep(2 ** attempt)
-        return None
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return response
+                response.release()
+            await asyncio.sleep(2 ** attempt)
     
-    def _get_csv_data(self, url: str) -> Optional[list]:
-        """Get CSV data from URL"""
+    async def _get_json(self, session: aiohttp.ClientSession, url: str,
+                        params: Optional[Dict] = None) -> Optional[Dict]:
+        """GET a JSON endpoint"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            csv_data = csv.DictReader(io.StringIO(response.text))
-            return list(csv_data)
+            async with await self._request(session, 'GET', url, params=params) as response:
+                return await response.json(content_type=None)
         except Exception as e:
-            print(f"CSV request failed: {e}")
+            print(f"Request failed: {e}")
+            return None
+    
+    async def _post_json(self, session: aiohttp.ClientSession, url: str, json_body: Dict,
+                         headers: Optional[Dict] = None) -> Optional[Dict]:
+        """POST a JSON body to a JSON endpoint"""
+        try:
+            async with await self._request(session, 'POST', url, json=json_body, headers=headers) as response:
+                return await response.json(content_type=None)
+        except Exception as e:
+            print(f"Request failed: {e}")
             return None
 
-    def get_btc_dominance_and_alt_cap(self) -> Tuple[Optional[float], Optional[float]]:
+    async def get_btc_dominance_and_alt_cap(self, session: aiohttp.ClientSession) -> Tuple[Optional[float], Optional[float]]:
         """Get BTC dominance and alt market cap from CoinGecko"""
         url = "https://api.coingecko.com/api/v3/global"
-        data = self._make_request(url)
+        data = await self._get_json(session, url)
         
         if not data:
             # Return mock data if API fails
@@ -62,17 +80,27 @@ class CryptoMetrics:
         except KeyError:
             return 58.5, 850_000_000_000
 
-    def get_alt_season_index(self) -> Optional[float]:
+    async def get_alt_season_index(self, session: aiohttp.ClientSession) -> Optional[float]:
         """Get alt season index from BlockchainCenter CSV"""
         url = "https://www.blockchaincenter.net/altcoin-season-index.csv"
         
         try:
-            csv_data = self._get_csv_data(url)
-            if not csv_data:
+            async with await self._request(session, 'GET', url) as response:
+                # Stream lines and keep only the header and the most recent entry (last row)
+                header = None
+                last_rows = deque(maxlen=1)
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    if header is None:
+                        header = line
+                    else:
+                        last_rows.append(line)
+            
+            if not last_rows:
                 return 45.2
             
-            # Get the most recent entry (last row)
-            latest_entry = csv_data[-1]
+            latest_entry = next(csv.DictReader(io.StringIO((header + last_rows[0]).decode('utf-8'))))
             
             # The CSV should have columns like 'date' and 'value' or 'index'
             # Try different possible column names
@@ -92,16 +120,16 @@ class CryptoMetrics:
             
         return 45.2  # Fallback mock data
 
-    def get_btc_funding_and_oi(self) -> Tuple[Optional[float], Optional[float]]:
+    async def get_btc_funding_and_oi(self, session: aiohttp.ClientSession) -> Tuple[Optional[float], Optional[float]]:
         """Get BTC funding rate and open interest from Binance"""
         try:
-            # Funding rate
+            # Funding rate and open interest, fetched together from the same host
             funding_url = "https://fapi.binance.com/fapi/v1/fundingRate"
-            funding_data = self._make_request(funding_url, params={'symbol': 'BTCUSDT'})
-            
-            # Open interest
             oi_url = "https://fapi.binance.com/fapi/v1/openInterest"
-            oi_data = self._make_request(oi_url, params={'symbol': 'BTCUSDT'})
+            funding_data, oi_data = await asyncio.gather(
+                self._get_json(session, funding_url, params={'symbol': 'BTCUSDT'}),
+                self._get_json(session, oi_url, params={'symbol': 'BTCUSDT'})
+            )
             
             if not funding_data or not oi_data:
                 return 0.08, 25_000_000_000
@@ -113,12 +141,12 @@ class CryptoMetrics:
         except Exception:
             return 0.08, 25_000_000_000
 
-    def get_hyperliquid_funding(self, symbol: str = "HYPE") -> Optional[float]:
+    async def get_hyperliquid_funding(self, session: aiohttp.ClientSession, symbol: str = "HYPE") -> Optional[float]:
         """Get funding rate from Hyperliquid"""
         url = "https://api.hyperliquid.xyz/info"
         json_data = {"type": "perpFundingRates", "symbol": symbol}
         
-        data = self._make_request(url, json_data=json_data)
+        data = await self._post_json(session, url, json_data)
         
         if not data:
             return 0.05
@@ -128,39 +156,38 @@ class CryptoMetrics:
         except (KeyError, IndexError):
             return 0.05
 
-    def get_stablecoin_delta(self) -> Optional[float]:
+    async def get_stablecoin_delta(self, session: aiohttp.ClientSession) -> Optional[float]:
         """Get 7-day stablecoin market cap change from DeFiLlama"""
         url = "https://stablecoins.llama.fi/stablecoins"
         
         try:
-            data = self._make_request(url)
-            if not data:
-                return 2_500_000_000
-            
-            # DeFiLlama returns array of stablecoin data
-            # Sum up all stablecoin market caps to get total
-            current_total = 0
-            
-            for stablecoin in data:
-                if 'circulating' in stablecoin and 'price' in stablecoin:
-                    current_total += stablecoin['circulating']['peggedUSD'] * stablecoin['price']
-                elif 'circulating' in stablecoin:
-                    current_total += stablecoin['circulating'].get('peggedUSD', 0)
-                elif 'mcap' in stablecoin:
-                    current_total += stablecoin['mcap']
+            async with await self._request(session, 'GET', url) as response:
+                # DeFiLlama returns {"peggedAssets": [...]}; stream the array and
+                # sum each asset's change against last week's circulating supply
+                weekly_change = 0.0
+                seen = 0
+                
+                async for stablecoin in ijson.items(response.content, 'peggedAssets.item'):
+                    seen += 1
+                    circulating = stablecoin.get('circulating') or {}
+                    prev_week = stablecoin.get('circulatingPrevWeek') or {}
+                    if 'peggedUSD' not in circulating or 'peggedUSD' not in prev_week:
+                        continue
+                    change = float(circulating['peggedUSD'] or 0) - float(prev_week['peggedUSD'] or 0)
+                    if stablecoin.get('price') is not None:
+                        change *= float(stablecoin['price'])
+                    weekly_change += change
             
-            # For 7-day delta, we'll use a simple heuristic
-            # In a real implementation, you'd store previous values
-            # For now, return a reasonable estimate based on market conditions
-            estimated_weekly_change = current_total * 0.02  # 2% weekly change estimate
+            if not seen:
+                return 2_500_000_000
             
-            return estimated_weekly_change
+            return weekly_change
             
         except Exception as e:
             print(f"Stablecoin delta fetch failed: {e}")
             return 2_500_000_000
 
-    def get_macro_events(self) -> list:
+    async def get_macro_events(self, session: aiohttp.ClientSession) -> list:
         """Get high-impact macro events from TradingEconomics or Finnhub"""
         # Try TradingEconomics first
         tradingecon_key = os.getenv('TRADINGECON_KEY')
@@ -168,7 +195,7 @@ class CryptoMetrics:
             try:
                 url = "https://api.tradingeconomics.com/calendar"
                 params = {'c': tradingecon_key, 'importance': 3}
-                data = self._make_request(url, params=params)
+                data = await self._get_json(session, url, params=params)
                 
                 if data:
                     return data[:5]  # Return top 5 events
@@ -181,7 +208,7 @@ class CryptoMetrics:
             try:
                 url = "https://finnhub.io/api/v1/calendar/economic"
                 params = {'token': finnhub_key}
-                data = self._make_request(url, params=params)
+                data = await self._get_json(session, url, params=params)
                 
                 if data and 'economicCalendar' in data:
                     # Filter for high importance events
@@ -194,14 +221,24 @@ class CryptoMetrics:
         # Return mock data if no API keys or both fail
         return [{"event": "Fed Meeting", "date": "2025-07-12", "importance": 3}]
 
-    def get_all_metrics(self) -> Dict:
-        """Get all metrics in one call"""
-        btc_dom, alt_cap = self.get_btc_dominance_and_alt_cap()
-        alt_index = self.get_alt_season_index()
-        btc_funding, btc_oi = self.get_btc_funding_and_oi()
-        hype_funding = self.get_hyperliquid_funding()
-        stable_delta = self.get_stablecoin_delta()
-        macro_events = self.get_macro_events()
+    async def _gather(self) -> Dict:
+        """Fetch every source concurrently on one session"""
+        async with self._make_session() as session:
+            (
+                (btc_dom, alt_cap),
+                alt_index,
+                (btc_funding, btc_oi),
+                hype_funding,
+                stable_delta,
+                macro_events
+            ) = await asyncio.gather(
+                self.get_btc_dominance_and_alt_cap(session),
+                self.get_alt_season_index(session),
+                self.get_btc_funding_and_oi(session),
+                self.get_hyperliquid_funding(session),
+                self.get_stablecoin_delta(session),
+                self.get_macro_events(session)
+            )
         
         return {
             'btc_dominance': btc_dom,
@@ -213,4 +250,8 @@ class CryptoMetrics:
             'stablecoin_delta': stable_delta,
             'macro_events': macro_events,
             'timestamp': time.time()
-        }
\ No newline at end of file
+        }
+
+    def get_all_metrics(self) -> Dict:
+        """Get all metrics in one call, fetching each source concurrently"""
+        return asyncio.run(self._gather())
\ No newline at end of file
@@ -1,20 +1,22 @@
+import atexit
 import os
+import queue
+import threading
 import requests
-from typing import Optional
 
-def send_telegram_message(text: str) -> bool:
-    """Send message to Telegram chat"""
+TELEGRAM_MAX_LENGTH = 4096
+
+_QUEUE = queue.Queue()
+_STOP = object()
+
+def _post_message(session: requests.Session, text: str) -> bool:
+    """POST a message to the configured Telegram chat"""
     token = os.getenv('TG_TOKEN')
     chat_id = os.getenv('TG_CHAT')
-    
-    if not token or not chat_id:
-        print(f"Telegram alert (no bot configured): {text}")
-        return False
-    
     url = f"https://api.telegram.org/bot{token}/sendMessage"
-    
+
     try:
-        response = requests.post(
+        response = session.post(
             url,
             json={
                 "chat_id": chat_id,
@@ -27,4 +29,54 @@ def send_telegram_message(text: str) -> bool:
         return True
     except Exception as e:
         print(f"Failed to send Telegram message: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def _worker():
+    """Drain queued messages and send them off the caller's thread"""
+    session = requests.Session()
+
+    while True:
+        text = _QUEUE.get()
+        if text is _STOP:
+            return
+
+        # Fold anything else already waiting into the same POST
+        stop = False
+        while True:
+            try:
+                pending = _QUEUE.get_nowait()
+            except queue.Empty:
+                break
+            if pending is _STOP:
+                stop = True
+                break
+            if len(text) + 2 + len(pending) > TELEGRAM_MAX_LENGTH:
+                _post_message(session, text)
+                text = pending
+            else:
+                text = f"{text}\n\n{pending}"
+
+        _post_message(session, text)
+        if stop:
+            return
+
+_WORKER = threading.Thread(target=_worker, name="telegram-sender", daemon=True)
+_WORKER.start()
+
+@atexit.register
+def _flush_on_exit():
+    """Give queued messages a chance to go out before the process exits"""
+    _QUEUE.put(_STOP)
+    _WORKER.join(timeout=10)
+
+def send_telegram_message(text: str) -> bool:
+    """Queue message for the Telegram chat; returns False if no bot is configured"""
+    token = os.getenv('TG_TOKEN')
+    chat_id = os.getenv('TG_CHAT')
+
+    if not token or not chat_id:
+        print(f"Telegram alert (no bot configured): {text}")
+        return False
+
+    _QUEUE.put(text)
+    return True
@@ -1,15 +1,81 @@
 import time
+import functools
+import threading
+import numpy as np
 from typing import Dict, Tuple, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from telegram_utils import send_telegram_message
-from journal import append_journal_entry
+from journal import append_journal_entries
+
+# Funding triggers as (trigger name, asset, metric key, |funding| threshold in %/8h)
+FUNDING_TRIGGERS = [
+    ("funding_btc", "BTC", "btc_funding_rate", 0.10),
+    ("funding_hype", "HYPE", "hype_funding_rate", 0.10),
+]
+FUNDING_THRESHOLDS = np.array([threshold for *_, threshold in FUNDING_TRIGGERS])
+
+# Fixed-condition triggers; each one's id is its index into the cooldown array
+TRIGGER_NAMES = [
+    "rotation",
+    "alt_season_full",
+    "alt_season_end",
+    *(name for name, *_ in FUNDING_TRIGGERS),
+    "stablecoin_issuance",
+]
+TRIGGER_IDS = {name: idx for idx, name in enumerate(TRIGGER_NAMES)}
+
+@functools.lru_cache(maxsize=512)
+def _parse_date(date_str: str) -> datetime:
+    """Parse a macro event date, memoized since the same events recur across renders"""
+    return datetime.strptime(date_str, '%Y-%m-%d')
+
+def _trigger_conditions(metrics: Dict) -> np.ndarray:
+    """Evaluate every fixed trigger condition into a bool array indexed by trigger id"""
+    btc_dom = metrics.get('btc_dominance', 60)
+    alt_index = metrics.get('alt_season_index', 50)
+    stable_delta = metrics.get('stablecoin_delta', 0)
+    funding = np.array([metrics.get(key, 0) for _, _, key, _ in FUNDING_TRIGGERS], dtype=float)
+
+    return np.concatenate((
+        [btc_dom < 60 and alt_index > 50, alt_index >= 75, alt_index <= 25],
+        np.abs(funding) >= FUNDING_THRESHOLDS,
+        [stable_delta >= 1_000_000_000],
+    ))
+
+def _eval_triggers(conditions: np.ndarray, now: float, last_fired: np.ndarray,
+                   cooldown_seconds: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Gate conditions on cooldowns; returns (fired mask, updated last-fired times)"""
+    fired = conditions & ((now - last_fired) >= cooldown_seconds)
+    return fired, np.where(fired, now, last_fired)
 
 class TriggerEngine:
     def __init__(self):
         self.last_allocation = None
         self.last_trigger_time = {}
         self.cooldown_hours = 12
-        
+        # Alerts queued while check_all_triggers runs; None means send immediately
+        self._pending_messages = None
+        # Every session shares this engine; serializes trigger state and the alert batch
+        self._lock = threading.RLock()
+        
+        # Last fire time per fixed trigger id; macro triggers stay in last_trigger_time
+        self._last_fired = np.zeros(len(TRIGGER_NAMES))
+        
+        # Allocation policy keyed on (BTC dominance phase, alt season phase)
+        self._alloc_table = {
+            (True, False): (0.70, 0.25, 0.05),  # BTC dominance phase
+            (False, True): (0.45, 0.50, 0.05),  # Alt season phase
+        }
+        self._neutral_allocation = (0.60, 0.35, 0.05)  # Neutral phase
+        
+        # Fixed-trigger checks run by check_all_triggers, in order
+        self._checks = [
+            ('rotation', self.check_rotation_triggers),
+            ('alt_season', self.check_alt_season_triggers),
+            ('funding', self.check_funding_triggers),
+            ('stablecoin', self.check_stablecoin_triggers),
+        ]
+    
     def _should_trigger(self, trigger_name: str) -> bool:
         """Check if enough time has passed since last trigger"""
         now = time.time()
@@ -20,90 +86,109 @@ class TriggerEngine:
         """Record trigger time"""
         self.last_trigger_time[trigger_name] = time.time()
     
+    def _fire(self, metrics: Dict, names: Optional[list] = None) -> np.ndarray:
+        """Evaluate fixed triggers (optionally only `names`) and record the ones that fire"""
+        conditions = _trigger_conditions(metrics)
+        if names is not None:
+            selected = np.zeros(len(TRIGGER_NAMES), dtype=bool)
+            selected[[TRIGGER_IDS[name] for name in names]] = True
+            conditions &= selected
+        
+        with self._lock:
+            fired, self._last_fired = _eval_triggers(
+                conditions, time.time(), self._last_fired, self.cooldown_hours * 3600
+            )
+        return fired
+    
+    def _queue_alert(self, message: str, journal_entry: Tuple):
+        """Queue an alert inside check_all_triggers, or send it right away otherwise"""
+        with self._lock:
+            if self._pending_messages is None:
+                self._flush_alerts([(message, journal_entry)])
+            else:
+                self._pending_messages.append((message, journal_entry))
+    
+    def _flush_alerts(self, pending: list):
+        """Hand queued alerts to the Telegram sender and write them in one journal call"""
+        if not pending:
+            return
+        
+        # The Telegram worker folds queued messages into as few posts as possible
+        for message, _ in pending:
+            send_telegram_message(message)
+        
+        append_journal_entries([entry for _, entry in pending])
+    
     def calculate_allocation(self, metrics: Dict) -> Tuple[float, float, float]:
         """Calculate BTC/ALTS/STABLES allocation based on metrics"""
         btc_dom = metrics.get('btc_dominance', 60)
         alt_index = metrics.get('alt_season_index', 50)
         
-        if btc_dom >= 61 and alt_index < 50:
-            return (0.70, 0.25, 0.05)  # BTC dominance phase
-        elif btc_dom < 60 and alt_index >= 50:
-            return (0.45, 0.50, 0.05)  # Alt season phase
-        else:
-            return (0.60, 0.35, 0.05)  # Neutral phase
+        key = (btc_dom >= 61 and alt_index < 50, btc_dom < 60 and alt_index >= 50)
+        return self._alloc_table.get(key, self._neutral_allocation)
     
-    def check_rotation_triggers(self, metrics: Dict) -> Optional[str]:
+    def check_rotation_triggers(self, metrics: Dict, fired: Optional[np.ndarray] = None) -> Optional[str]:
         """Check BTC/ALT rotation triggers"""
-        btc_dom = metrics.get('btc_dominance', 60)
-        alt_index = metrics.get('alt_season_index', 50)
+        if fired is None:
+            fired = self._fire(metrics, ["rotation"])
         
-        trigger_name = "rotation"
-        
-        if btc_dom < 60 and alt_index > 50 and self._should_trigger(trigger_name):
-            self._record_trigger(trigger_name)
+        if fired[TRIGGER_IDS["rotation"]]:
+            btc_dom = metrics.get('btc_dominance', 60)
+            alt_index = metrics.get('alt_season_index', 50)
             message = f"🔄 *BTC.D < 60% & alt momentum ↑* – start rotation.\nBTC Dom: {btc_dom:.1f}% | Alt Index: {alt_index:.1f}"
-            send_telegram_message(message)
-            append_journal_entry("ROTATION", -10, "BTC.D <60, rotate", "😐")
+            self._queue_alert(message, ("ROTATION", -10, "BTC.D <60, rotate", "😐"))
             return message
         
         return None
     
-    def check_alt_season_triggers(self, metrics: Dict) -> Optional[str]:
+    def check_alt_season_triggers(self, metrics: Dict, fired: Optional[np.ndarray] = None) -> Optional[str]:
         """Check alt season intensity triggers"""
+        if fired is None:
+            fired = self._fire(metrics, ["alt_season_full", "alt_season_end"])
+        
         alt_index = metrics.get('alt_season_index', 50)
         
         # Full alt season
-        if alt_index >= 75 and self._should_trigger("alt_season_full"):
-            self._record_trigger("alt_season_full")
+        if fired[TRIGGER_IDS["alt_season_full"]]:
             message = f"🚀 *Full alt-season (≥ 75)*\nAlt Index: {alt_index:.1f}"
-            send_telegram_message(message)
-            append_journal_entry("ALTS", +25, "Full alt-season", "🚀")
+            self._queue_alert(message, ("ALTS", +25, "Full alt-season", "🚀"))
             return message
         
         # Back to BTC dominance
-        elif alt_index <= 25 and self._should_trigger("alt_season_end"):
-            self._record_trigger("alt_season_end")
+        elif fired[TRIGGER_IDS["alt_season_end"]]:
             message = f"📉 *Back to BTC dominance*\nAlt Index: {alt_index:.1f}"
-            send_telegram_message(message)
-            append_journal_entry("BTC", +20, "Back to BTC dominance", "📉")
+            self._queue_alert(message, ("BTC", +20, "Back to BTC dominance", "📉"))
             return message
         
         return None
     
-    def check_funding_triggers(self, metrics: Dict) -> Optional[str]:
+    def check_funding_triggers(self, metrics: Dict, fired: Optional[np.ndarray] = None) -> Optional[str]:
         """Check funding rate and leverage triggers"""
-        btc_funding = metrics.get('btc_funding_rate', 0)
-        hype_funding = metrics.get('hype_funding_rate', 0)
+        if fired is None:
+            fired = self._fire(metrics, [name for name, *_ in FUNDING_TRIGGERS])
         
         messages = []
         
-        # BTC funding check
-        if abs(btc_funding) >= 0.10 and self._should_trigger("funding_btc"):
-            self._record_trigger("funding_btc")
-            message = f"⚠️ *Crowded leverage: BTC*\nFunding: {btc_funding:.3f}%/8h"
-            send_telegram_message(message)
-            append_journal_entry("BTC", -20, f"Crowded leverage: BTC. Funding {btc_funding:.3f}%", "⚠️")
-            messages.append(message)
-        
-        # HYPE funding check
-        if abs(hype_funding) >= 0.10 and self._should_trigger("funding_hype"):
-            self._record_trigger("funding_hype")
-            message = f"⚠️ *Crowded leverage: HYPE*\nFunding: {hype_funding:.3f}%/8h"
-            send_telegram_message(message)
-            append_journal_entry("HYPE", -20, f"Crowded leverage: HYPE. Funding {hype_funding:.3f}%", "⚠️")
+        for trigger_name, asset, key, _ in FUNDING_TRIGGERS:
+            if not fired[TRIGGER_IDS[trigger_name]]:
+                continue
+            
+            funding = metrics.get(key, 0)
+            message = f"⚠️ *Crowded leverage: {asset}*\nFunding: {funding:.3f}%/8h"
+            self._queue_alert(message, (asset, -20, f"Crowded leverage: {asset}. Funding {funding:.3f}%", "⚠️"))
             messages.append(message)
         
         return "; ".join(messages) if messages else None
     
-    def check_stablecoin_triggers(self, metrics: Dict) -> Optional[str]:
+    def check_stablecoin_triggers(self, metrics: Dict, fired: Optional[np.ndarray] = None) -> Optional[str]:
         """Check stablecoin issuance triggers"""
-        stable_delta = metrics.get('stablecoin_delta', 0)
+        if fired is None:
+            fired = self._fire(metrics, ["stablecoin_issuance"])
         
-        if stable_delta >= 1_000_000_000 and self._should_trigger("stablecoin_issuance"):
-            self._record_trigger("stablecoin_issuance")
+        if fired[TRIGGER_IDS["stablecoin_issuance"]]:
+            stable_delta = metrics.get('stablecoin_delta', 0)
             message = f"💰 *New stable-coin issuance – ammo loaded*\n7d Change: ${stable_delta/1e9:.1f}B"
-            send_telegram_message(message)
-            append_journal_entry("STABLES", +10, "New stable-coin issuance", "💰")
+            self._queue_alert(message, ("STABLES", +10, "New stable-coin issuance", "💰"))
             return message
         
         return None
@@ -116,14 +201,13 @@ class TriggerEngine:
         
         for event in macro_events:
             try:
-                event_date = datetime.strptime(event['date'], '%Y-%m-%d')
+                event_date = _parse_date(event['date'])
                 time_diff = abs((event_date - now).total_seconds() / 3600)
                 
                 if time_diff <= 12 and self._should_trigger(f"macro_{event['event']}"):
                     self._record_trigger(f"macro_{event['event']}")
                     message = f"📅 *Macro in play: {event['event']}*\nDate: {event['date']}"
-                    send_telegram_message(message)
-                    append_journal_entry("CASH", 0, f"Macro in play: {event['event']}", "📅")
+                    self._queue_alert(message, ("CASH", 0, f"Macro in play: {event['event']}", "📅"))
                     return message
             except Exception:
                 continue
@@ -132,25 +216,28 @@ class TriggerEngine:
     
     def check_all_triggers(self, metrics: Dict) -> Dict:
         """Check all trigger conditions"""
-        results = {
-            'rotation': self.check_rotation_triggers(metrics),
-            'alt_season': self.check_alt_season_triggers(metrics),
-            'funding': self.check_funding_triggers(metrics),
-            'stablecoin': self.check_stablecoin_triggers(metrics),
-            'macro': self.check_macro_triggers(metrics)
-        }
-        
-        # Calculate current allocation
-        current_allocation = self.calculate_allocation(metrics)
-        
-        # Check if allocation changed
-        if self.last_allocation and self.last_allocation != current_allocation:
-            btc_change = (current_allocation[0] - self.last_allocation[0]) * 100
-            message = f"📊 *Allocation Update*\nBTC: {current_allocation[0]:.0%} | ALTS: {current_allocation[1]:.0%} | STABLES: {current_allocation[2]:.0%}"
-            send_telegram_message(message)
-            append_journal_entry("ALLOCATION", btc_change, "Auto allocation update", "📊")
-        
-        self.last_allocation = current_allocation
-        results['allocation'] = current_allocation
-        
-        return results
\ No newline at end of file
+        with self._lock:
+            # Batch every alert raised below into a single flush
+            self._pending_messages = []
+            try:
+                # Evaluate every fixed trigger in one pass, then map fired bits to messages
+                fired = self._fire(metrics)
+                results = {name: check(metrics, fired) for name, check in self._checks}
+                results['macro'] = self.check_macro_triggers(metrics)
+                
+                # Calculate current allocation
+                current_allocation = self.calculate_allocation(metrics)
+                
+                # Check if allocation changed
+                if self.last_allocation and self.last_allocation != current_allocation:
+                    btc_change = (current_allocation[0] - self.last_allocation[0]) * 100
+                    message = f"📊 *Allocation Update*\nBTC: {current_allocation[0]:.0%} | ALTS: {current_allocation[1]:.0%} | STABLES: {current_allocation[2]:.0%}"
+                    self._queue_alert(message, ("ALLOCATION", btc_change, "Auto allocation update", "📊"))
+                
+                self.last_allocation = current_allocation
+                results['allocation'] = current_allocation
+            finally:
+                pending, self._pending_messages = self._pending_messages, None
+                self._flush_alerts(pending)
+            
+            return results
\ No newline at end of file